@@ -130,6 +130,11 @@ if __name__ == "__main__":
         image_url_template=OPENWEATHER_API_IMAGE_URL,
         weather_data=weather_data,
         logger=logger,
+        debug=OPENWEATHER_API_DEBUG,
+        connections_limit=OPENWEATHER_API_CONNECTIONS_LIMIT,
+        dns_cache_ttl=OPENWEATHER_API_DNS_CACHE_TTL,
+        keepalive_timeout=OPENWEATHER_API_KEEPALIVE_TIMEOUT,
+        request_timeout=OPENWEATHER_API_REQUEST_TIMEOUT,
     )
 
     # Creating task scheduler instance
@@ -159,7 +164,10 @@ if __name__ == "__main__":
     scheduler.start()
 
     # Getting and starting asyncio event loop
+    loop = asyncio.get_event_loop()
     try:
-        asyncio.get_event_loop().run_forever()
+        loop.run_forever()
     except KeyboardInterrupt:
+        # Closing pooled HTTP connections of weather updater
+        loop.run_until_complete(weather_updater.close())
         sys.exit(1)
@@ -29,6 +29,23 @@ OPENWEATHER_API_IMAGE_URL = environ.get(
     "TG_AVATAR_OPENWEATHER_API_IMAGE_URL",
     "http://openweathermap.org/img/wn/{}@2x.png",
 )
+# Full pydantic validation of OpenWeatherMap responses (slow, for debugging)
+OPENWEATHER_API_DEBUG = environ.get(
+    "TG_AVATAR_OPENWEATHER_API_DEBUG", ''
+).lower() in ("1", "true", "yes")
+# HTTP connection pool settings for OpenWeatherMap API requests
+OPENWEATHER_API_CONNECTIONS_LIMIT = int(
+    environ.get("TG_AVATAR_OPENWEATHER_API_CONNECTIONS_LIMIT", "10")
+)
+OPENWEATHER_API_DNS_CACHE_TTL = int(
+    environ.get("TG_AVATAR_OPENWEATHER_API_DNS_CACHE_TTL", "600")
+)
+OPENWEATHER_API_KEEPALIVE_TIMEOUT = float(
+    environ.get("TG_AVATAR_OPENWEATHER_API_KEEPALIVE_TIMEOUT", "60")
+)
+OPENWEATHER_API_REQUEST_TIMEOUT = float(
+    environ.get("TG_AVATAR_OPENWEATHER_API_REQUEST_TIMEOUT", "10")
+)
 
 # Customization
 __bg_color = environ.get("TG_AVATAR_COLOR_BACKGROUND", "255,255,255")
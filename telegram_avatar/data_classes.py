@@ -21,6 +21,20 @@ class WeatherData:
         return all(self.__dict__.values())
 
 
+@dataclass
+class WeatherObservation:
+    """
+    Dataclass to keep the last observation received for a city together
+    with HTTP cache validators for conditional requests.
+    """
+
+    dt: int
+    temperature: float
+    weather_image: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
 # Models for validating response from OpenWeatherMap
 
 class OpenWeatherMapCoordinates(BaseModel):
@@ -1,11 +1,14 @@
+import asyncio
 import os
-from aiohttp import ClientSession, ClientError
+from aiohttp import ClientSession, ClientError, ClientTimeout, TCPConnector
 from logging import Logger
 from pydantic import ValidationError
-from typing import Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from telegram_avatar.config import WEATHER_ICONS_FOLDER_NAME
-from telegram_avatar.data_classes import WeatherData, OpenWeatherMap
+from telegram_avatar.data_classes import (
+    WeatherData, WeatherObservation, OpenWeatherMap,
+)
 from telegram_avatar.exceptions import (
     WeatherDataDownloadError, ImageDownloadError,
 )
@@ -20,6 +23,11 @@ class OpenWeatherMapAPI:
             image_url_template: str,
             weather_data: WeatherData,
             logger: Logger,
+            debug: bool = False,
+            connections_limit: int = 10,
+            dns_cache_ttl: int = 600,
+            keepalive_timeout: float = 60,
+            request_timeout: float = 10,
     ):
         """
         Initializer.
@@ -29,6 +37,14 @@ class OpenWeatherMapAPI:
             image_url_template: URL template for downloading weather image.
             weather_data: the 'volume' in which weather data will be published.
             logger: logger object.
+            debug: set True to validate the full response body with
+                pydantic models instead of extracting only needed fields.
+            connections_limit: max number of simultaneous connections
+                in the pool.
+            dns_cache_ttl: time (in seconds) to keep resolved DNS records.
+            keepalive_timeout: time (in seconds) to keep idle connections
+                open for reuse.
+            request_timeout: total timeout (in seconds) for one request.
         """
 
         self._api_token = api_token
@@ -36,7 +52,49 @@ class OpenWeatherMapAPI:
         self._api_image_url = image_url_template
         self._weather_data = weather_data
         self._logger = logger
-        self._client_session = ClientSession()
+        self._debug = debug
+        self._connections_limit = connections_limit
+        self._dns_cache_ttl = dns_cache_ttl
+        self._keepalive_timeout = keepalive_timeout
+        self._request_timeout = request_timeout
+        # Session is created lazily inside the running event loop
+        self._client_session: Optional[ClientSession] = None
+        # Last observations by city id
+        self._observations: Dict[int, WeatherObservation] = {}
+
+    def _get_client_session(self) -> ClientSession:
+        """
+        Method which returns HTTP client session with keep-alive connection
+        pool, creating it if necessary. Must be called inside running
+        event loop.
+        Returns:
+            aiohttp.ClientSession object.
+        """
+
+        if self._client_session is None or self._client_session.closed:
+            connector = TCPConnector(
+                limit=self._connections_limit,
+                use_dns_cache=True,
+                ttl_dns_cache=self._dns_cache_ttl,
+                keepalive_timeout=self._keepalive_timeout,
+            )
+            self._client_session = ClientSession(
+                connector=connector,
+                timeout=ClientTimeout(total=self._request_timeout),
+            )
+
+        return self._client_session
+
+    async def close(self) -> None:
+        """
+        Method which closes HTTP client session and its connection pool.
+        Returns:
+            None.
+        """
+
+        if self._client_session is not None:
+            await self._client_session.close()
+            self._client_session = None
 
     def _weather_image_exists(self, image_name: str) -> bool:
         """
@@ -65,7 +123,7 @@ class OpenWeatherMapAPI:
         Raises:
             ImageDownloadError: if OpenWeatherMap API returns response
                 with status code different from 200 or request raises
-                aiohttp.ClientError.
+                aiohttp.ClientError or times out.
         Returns:
             None.
         """
@@ -73,18 +131,20 @@ class OpenWeatherMapAPI:
         url = self._api_image_url.format(image_name)
         self._logger.info(f"Loading image with name: {image_name}...")
         try:
-            resp = await self._client_session.get(url=url)
-        except ClientError as request_error:
+            async with self._get_client_session().get(url=url) as resp:
+                self._logger.info(
+                    f"Getting response with status: {resp.status}"
+                )
+                if resp.status != 200:
+                    raise ImageDownloadError(
+                        "Couldn't download weather icon from OpenWeatherMap..."
+                    )
+                data = await resp.read()
+        except (ClientError, asyncio.TimeoutError) as request_error:
             self._logger.exception(request_error)
             raise ImageDownloadError(
                 "Couldn't download weather icon from OpenWeatherMap..."
             )
-        self._logger.info(f"Getting response with status: {resp.status}")
-        if resp.status != 200:
-            raise ImageDownloadError(
-                "Couldn't download weather icon from OpenWeatherMap..."
-            )
-        data = await resp.read()
         new_image_path = os.path.join(
             os.getcwd(),
             WEATHER_ICONS_FOLDER_NAME,
@@ -94,18 +154,59 @@ class OpenWeatherMapAPI:
             image_file.write(data)
         self._logger.info(f"Saving new image ({len(data)} bytes)")
 
+    def _parse_weather_data(
+            self,
+            response_body: Dict[str, Any],
+    ) -> Tuple[int, float, str]:
+        """
+        Method which extracts observation time, temperature and weather
+        icon name from OpenWeatherMap API response body. Only needed fields
+        are read unless debug mode is on, then the full body is validated.
+        Args:
+            response_body: decoded JSON body of OpenWeatherMap API response.
+        Raises:
+            WeatherDataDownloadError: if response body is malformed.
+        Returns:
+            tuple with observation time, temperature and weather icon name.
+        """
+
+        try:
+            if self._debug:
+                validated_response_body = OpenWeatherMap(**response_body)
+                self._logger.info(
+                    f"Validated response body: {validated_response_body}"
+                )
+                return (
+                    validated_response_body.dt,
+                    validated_response_body.main.temp,
+                    validated_response_body.weather[0].icon,
+                )
+            return (
+                int(response_body["dt"]),
+                float(response_body["main"]["temp"]),
+                str(response_body["weather"][0]["icon"]),
+            )
+        except (
+                ValidationError, KeyError, IndexError, TypeError, ValueError,
+        ) as error:
+            self._logger.exception(error)
+            raise WeatherDataDownloadError(
+                "Couldn't update weather data from OpenWeatherMap..."
+            )
+
     async def _get_weather_data(self, city_id: int) -> Tuple[float, str]:
         """
-        Method which makes a GET request to OpenWeatherMap API in order to
-        get current temperature and weather icon name to your city.
-        Returns the tuple of updated weather data (temperature
-        and weather icon name).
+        Method which makes a conditional GET request to OpenWeatherMap API
+        in order to get current temperature and weather icon name to your
+        city. If the resource is not modified or observation time is the
+        same as in the previous response, the cached data is returned.
         Args:
             city_id: the code of the city for which you want to receive
                 the weather data.
         Raises:
             WeatherDataDownloadError: if OpenWeatherMap API returns
-                response with status code different from 200.
+                response with status code different from 200 or 304,
+                or request raises aiohttp.ClientError or times out.
         Returns:
             tuple with current temperature and weather icon name.
         """
@@ -115,42 +216,62 @@ class OpenWeatherMapAPI:
             "id": city_id,
             "appid": self._api_token,
         }
+        # Cache validators from the previous response for this city
+        observation = self._observations.get(city_id)
+        headers = {}
+        if observation is not None:
+            if observation.etag:
+                headers["If-None-Match"] = observation.etag
+            if observation.last_modified:
+                headers["If-Modified-Since"] = observation.last_modified
         self._logger.info(
-            f"Updating weather information with payload: {payload}"
+            f"Updating weather information for city with id: {city_id}"
         )
         # Trying making request
         try:
-            response = await self._client_session.get(
+            async with self._get_client_session().get(
                 url=self._api_url,
                 params=payload,
-            )
-        except ClientError as request_error:
-            self._logger.exception(request_error)
-            raise WeatherDataDownloadError(
-                "Couldn't update weather data from OpenWeatherMap..."
-            )
-        # Trying validate response body
-        try:
-            response_body = await response.json(encoding="utf-8")
-            validated_response_body = OpenWeatherMap(**response_body)
-        except ValidationError as error:
+                headers=headers,
+            ) as response:
+                self._logger.info(
+                    f"New response from weather service. "
+                    f"Status: {response.status}"
+                )
+                if response.status == 304 and observation is not None:
+                    return observation.temperature, observation.weather_image
+                if response.status != 200:
+                    raise WeatherDataDownloadError(
+                        "Couldn't update weather data from OpenWeatherMap..."
+                    )
+                etag = response.headers.get("ETag")
+                last_modified = response.headers.get("Last-Modified")
+                response_body = await response.json(encoding="utf-8")
+        except (ClientError, asyncio.TimeoutError, ValueError) as error:
             self._logger.exception(error)
             raise WeatherDataDownloadError(
                 "Couldn't update weather data from OpenWeatherMap..."
             )
-        self._logger.info(
-            f"New response from weather service. "
-            f"Status: {response.status}, body: {validated_response_body}"
+        # Skip processing if observation is the same as previous one
+        if isinstance(response_body, dict) and observation is not None \
+                and observation.dt == response_body.get("dt"):
+            dt = observation.dt
+            observation.etag = etag
+            observation.last_modified = last_modified
+            self._logger.info(f"Observation time {dt} has not changed")
+            return observation.temperature, observation.weather_image
+        dt, new_temperature, new_icon = self._parse_weather_data(
+            response_body
         )
-        if response.status != 200:
-            raise WeatherDataDownloadError(
-                "Couldn't update weather data from OpenWeatherMap..."
-            )
-        # If request is success updating weather data with actual
-        new_temperature = validated_response_body.main.temp
-        new_icon = validated_response_body.weather[0].icon
         if not self._weather_image_exists(new_icon):
             await self._get_weather_image(new_icon)
+        self._observations[city_id] = WeatherObservation(
+            dt=dt,
+            temperature=new_temperature,
+            weather_image=new_icon,
+            etag=etag,
+            last_modified=last_modified,
+        )
 
         return new_temperature, new_icon
 
@@ -172,3 +293,4 @@ class OpenWeatherMapAPI:
             self._logger.exception(err)
             self._weather_data.current_temperature = None
             self._weather_data.current_weather_image = None
+            self._observations.pop(city_id, None)